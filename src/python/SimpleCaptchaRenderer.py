@@ -0,0 +1,1066 @@
+##
+#   SimpleCaptcha
+#   Simple image-based macthematical captcha
+#   image renderer and png encoder, loaded on first generate()
+#
+#   @version 2.6.0
+#   https://github.com/foo123/simple-captcha
+#
+##
+import math, random, base64, zlib, struct, threading
+from collections import OrderedDict
+
+def image(chars, color, background, difficulty, distortion_type, distortion, backend='python'):
+    glyphs = glyphAtlas()
+
+    metrics = glyphs.metrics()
+    cw = metrics['width']
+    ch = metrics['height']
+    n = len(chars)
+    space = 1
+    x0 = 10
+    y0 = 10
+    w = n * cw + (n-1) * space + 2 * x0
+    h = ch + 2 * y0
+    wh = w*h
+
+    # image tiles are repeated from a random offset
+    if isinstance(background, dict): background = Tile(background, rand(0, int(background['width'])-1), rand(0, int(background['height'])-1))
+    if isinstance(color, dict): color = Tile(color, rand(0, int(color['width'])-1), rand(0, int(color['height'])-1))
+
+    # gray colors on gray background are rendered in a single channel, else in rgb
+    bpp = 1 if isGray(color) and isGray(background) else 3
+    gray = 1 == bpp
+
+    # opaque img bitmap, starts as a copy of the (cached) background
+    if isinstance(background, list):
+        img = bytearray(backgrounds.get((tuple(background), w, h, bpp), lambda: backgroundPlane(background, w, h, bpp)))
+    else:
+        img = bytearray(backgroundPlane(background, w, h, bpp))
+
+    # optional numpy backend, pure python if numpy is not available,
+    # scale-distorted glyphs are too few and small for numpy to be faster, so they are always blended in python
+    np = numpy() if ('numpy' == backend) and not ((0 < difficulty) and (SCALE_DISTORTION == distortion_type)) else None
+    if np is not None: return (numpyImage(np, img, w, h, bpp, glyphs, chars, color, difficulty, distortion_type, distortion), w, h)
+
+    # render chars, only inked pixels of each glyph are visited
+    if (0 < difficulty) and (SCALE_DISTORTION == distortion_type):
+        # create scale-distorted image data based on difficulty level
+        phase = float(rand(0, 2)) * 3.14 / 2.0
+        amplitude = float(distortion[str(difficulty)]) if isinstance(distortion, dict) and (str(difficulty) in distortion) else (0.5 if 3 == difficulty else (0.25 if 2 == difficulty else 0.15))
+        x0 = max(0, round((w - n*(1.0+amplitude)*cw - (n-1)*space) / 2))
+        for k in range(n):
+            scale = (1.0 + amplitude * math.sin(phase + 6.28 * 2 * k / n))
+            glyph = glyphs.get_glyph(chars[k])
+            xk = 10 + k*(cw+space)
+            sw, sh, ink = scaledGlyphs.get((glyph, scale, xk), lambda: scaleGlyph(glyph, scale, xk, cw, ch))
+            sw = min(w, sw)
+            sh = min(h, sh)
+            y0 = max(0, round((h - sh) / 2))
+            fill = colorFill(color, 0, sh/2, sw, sh/2)
+            for xs, ys, alpha in struct.iter_unpack('<HHB', ink):
+                if (xs < sw) and (ys < sh):
+                    beta = (255 - alpha) << 8
+                    alpha <<= 8
+                    rgb = fill.at(xs, ys)
+                    j = (x0+xs + (y0+ys)*w) * bpp
+                    if gray:
+                        img[j] = MUL255[beta | img[j]] + MUL255[alpha | (rgb & 255)]
+                    else:
+                        img[j  ] = MUL255[beta | img[j  ]] + MUL255[alpha | ((rgb >> 16) & 255)]
+                        img[j+1] = MUL255[beta | img[j+1]] + MUL255[alpha | ((rgb >> 8) & 255)]
+                        img[j+2] = MUL255[beta | img[j+2]] + MUL255[alpha | (rgb & 255)]
+            x0 += space + sw
+    elif (0 < difficulty) and (distortion_type in WARPS):
+        # create position-distorted image data based on difficulty level
+        phase = float(rand(0, 2)) * 3.14 / 2.0
+        amplitude = float(distortion[str(difficulty)]) if isinstance(distortion, dict) and (str(difficulty) in distortion) else (5.0 if 3 == difficulty else (3.0 if 2 == difficulty else 1.5))
+        fill = colorFill(color, 0, ch/2, cw, ch/2)
+        dy = warpTable(distortion_type, w, amplitude, phase)
+        for k in range(n):
+            xk = 10 + k*(cw+space)
+            for x, y, alpha in struct.iter_unpack('BBB', glyphs.get_glyph(chars[k]).ink):
+                beta = (255 - alpha) << 8
+                alpha <<= 8
+                # inked pixel at (x0, y0 + dy[x0]) is displaced to (x0, y0)
+                x0 = xk + x
+                y0 = 10 + y - dy[x0]
+                if 0 <= y0 < h:
+                    rgb = fill.at(x + space, y0 - 10)
+                    j = (x0 + y0*w) * bpp
+                    if gray:
+                        img[j] = MUL255[beta | img[j]] + MUL255[alpha | (rgb & 255)]
+                    else:
+                        img[j  ] = MUL255[beta | img[j  ]] + MUL255[alpha | ((rgb >> 16) & 255)]
+                        img[j+1] = MUL255[beta | img[j+1]] + MUL255[alpha | ((rgb >> 8) & 255)]
+                        img[j+2] = MUL255[beta | img[j+2]] + MUL255[alpha | (rgb & 255)]
+    else:
+        # create non-distorted image data, only inside the ink bounding boxes of the placed glyphs,
+        # the fill is sampled in cell coordinates so each of its rows is shared by all glyphs
+        placed = [glyphs.get_glyph(c) for c in chars]
+        top = min(glyph.bbox[1] for glyph in placed)
+        bottom = max(glyph.bbox[1] + glyph.bbox[3] for glyph in placed)
+        fill = colorFill(color, 0, ch/2, cw, ch/2)
+        rows = [fill.fill_row(y, space, cw)[::3 if gray else 1] if top <= y < bottom else None for y in range(ch)]
+        for k, glyph in enumerate(placed):
+            xk = 10 + k*(cw+space)
+            for x, y, m, alpha in struct.iter_unpack('BBBB', glyph.spans):
+                row = rows[y]
+                i = x * bpp
+                j = (xk+x + (10+y)*w) * bpp
+                if 255 == alpha:
+                    # opaque run of m pixels, copied from the fill row as is
+                    img[j:j + m*bpp] = row[i:i + m*bpp]
+                elif gray:
+                    img[j] = MUL255[((255 - alpha) << 8) | img[j]] + MUL255[(alpha << 8) | row[i]]
+                else:
+                    beta = (255 - alpha) << 8
+                    alpha <<= 8
+                    img[j  ] = MUL255[beta | img[j  ]] + MUL255[alpha | row[i  ]]
+                    img[j+1] = MUL255[beta | img[j+1]] + MUL255[alpha | row[i+1]]
+                    img[j+2] = MUL255[beta | img[j+2]] + MUL255[alpha | row[i+2]]
+
+    return (img, w, h)
+
+_numpy = None
+
+def numpy():
+    # numpy is optional, imported on first use of the numpy backend
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy as np
+            _numpy = np
+        except ImportError:
+            _numpy = False
+    return _numpy if _numpy is not False else None
+
+def numpyImage(np, img, w, h, bpp, glyphs, chars, color, difficulty, distortion_type, distortion):
+    # same as image() with numpy arrays for undistorted and position-distorted text,
+    # chars are composited over the gray or rgb background img in place
+    metrics = glyphs.metrics()
+    cw = metrics['width']
+    ch = metrics['height']
+    n = len(chars)
+    space = 1
+    canvas = np.frombuffer(img, dtype=np.uint8).reshape(h, w, bpp)
+
+    # coverage plane of the undistorted text, one glyph cell every cw+space columns
+    size = cw * ch
+    cells = np.frombuffer(glyphs.coverage(), dtype=np.uint8).reshape(-1, ch, cw)[[glyphs.get_glyph(c).offset // size for c in chars]]
+    text = np.zeros((ch, n, cw+space), dtype=np.uint8)
+    text[:, :, :cw] = cells.transpose(1, 0, 2)
+    coverage = np.zeros((h, w), dtype=np.uint8)
+    coverage[10:10+ch, 10:10+n*(cw+space)] = text.reshape(ch, n*(cw+space))
+    columns = np.arange(w)
+    if (0 < difficulty) and (distortion_type in WARPS):
+        # position-distorted, canvas pixel (x, y) gathers the text pixel at (x, y + dy[x])
+        phase = float(rand(0, 2)) * 3.14 / 2.0
+        amplitude = float(distortion[str(difficulty)]) if isinstance(distortion, dict) and (str(difficulty) in distortion) else (5.0 if 3 == difficulty else (3.0 if 2 == difficulty else 1.5))
+        rows = np.arange(h)[:, None] + np.array(warpTable(distortion_type, w, amplitude, phase), dtype=np.intp)[None, :]
+        coverage = np.where((0 <= rows) & (rows < h), coverage[np.clip(rows, 0, h-1), columns[None, :]], 0)
+    # the fill is sampled at (x + space, y - 10) for the glyph cell column x of canvas pixel (x, y)
+    fill = colorFill(color, 0, ch/2, cw, ch/2)
+    rgb = fillPlane(np, fill, space, -10, cw+space, h)[:, (columns - 10) % (cw+space), :bpp]
+    canvas[:, :, :] = blendPlane(np, canvas, rgb, coverage[:, :, None])
+
+    return img
+
+def fillPlane(np, fill, x0, y0, width, height):
+    # rgb pixels of a rectangle of a fill, as a (height, width, 3) array
+    if isinstance(fill, Gradient): return fill.fill_plane(np, x0, y0, width, height)
+    rows = b''.join(fill.fill_row(y, x0, width) for y in range(y0, y0 + height))
+    return np.frombuffer(rows, dtype=np.uint8).reshape(height, width, 3)
+
+def blendPlane(np, dst, src, alpha):
+    # src over dst with 8-bit alpha, rounded exactly as the MUL255 table
+    alpha = alpha.astype(np.uint32)
+    return ((2*(255 - alpha)*dst + 255) // 510 + (2*alpha*src + 255) // 510).astype(np.uint8)
+
+def rand(m, M):
+    return random.randrange(m, M+1)
+
+def split(s):
+    return [GLYPH_INDEX[c] for c in str(s)]
+
+def imagepng(img, width, height, metaData=None):
+    return 'data:image/png;base64,' + base64.b64encode(PNGPacker(metaData).toPNG(img, width, height)).decode("ascii")
+
+def colorAt(x, y, colors, x1, y1, x2, y2):
+    if callable(colors): return colors(x, y)
+    # linear gradient interpolation between colors
+    dx = x2 - x1
+    dy = y2 - y1
+    vert = 0 == dx
+    hor = 0 == dy
+    f = 2*dx*dy
+    px = x - x1
+    py = y - y1
+    t = 0 if hor and vert else (py/dy if vert else (px/dx if hor else (px*dy + py*dx)/f))
+    return gradientAt(t, colors)
+
+def gradientAt(t, colors):
+    # color at position t (0 to 1) along the gradient
+    l = len(colors) - 1
+    if 0 >= t:
+        c0 = c1 = 0
+        t = 0
+    elif 1 <= t:
+        c0 = c1 = l
+        t = 1
+    else:
+        c0 = math.floor(l*t)
+        c1 = c0 if l == c0 else (c0 + 1)
+    rgb0 = colors[c0]
+    rgb1 = colors[c1]
+    t = (l*t - c0)/(c1 - c0) if c1 > c0 else t
+    return [
+    clamp((1-t)*((rgb0 >> 16) & 255) + t*((rgb1 >> 16) & 255)),
+    clamp((1-t)*((rgb0 >> 8) & 255) + t*((rgb1 >> 8) & 255)),
+    clamp((1-t)*((rgb0) & 255) + t*((rgb1) & 255))
+    ]
+
+class LRUCache:
+    """
+    thread-safe, least recently used cache with hit/miss counters,
+    bounded in number of entries and optionally in total bytes of its (bytes) values
+    """
+    def __init__(self, size, maxbytes=0):
+        self.size = size
+        self.maxbytes = maxbytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, create):
+        with self._lock:
+            if key in self._items:
+                self.hits += 1
+                self._items.move_to_end(key)
+                return self._items[key]
+            self.misses += 1
+        value = create()
+        with self._lock:
+            if key in self._items: return self._items[key]
+            if 0 < self.maxbytes:
+                if len(value) > self.maxbytes: return value
+                self.bytes += len(value)
+            self._items[key] = value
+            while (len(self._items) > self.size) or (0 < self.maxbytes and self.bytes > self.maxbytes):
+                self._evict()
+        return value
+
+    def _evict(self):
+        key, value = self._items.popitem(last=False)
+        if 0 < self.maxbytes: self.bytes -= len(value)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return {
+            'size': len(self._items),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+# fixed-point alpha compositing, MUL255[(a << 8) | v] = round(a * v / 255), so that
+# MUL255[((255 - a) << 8) | dst] + MUL255[(a << 8) | src] blends src over dst with 8-bit alpha a,
+# within 1 LSB of the exactly rounded blend and never above 255
+MUL255 = bytes((2*a*v + 255) // 510 for a in range(256) for v in range(256))
+
+def packRGB(c):
+    return (c[0] << 16) | (c[1] << 8) | c[2]
+
+def rgbRow(fill, y, x0, width):
+    # rgb pixels of a row, one fill.at() per pixel
+    row = bytearray(width * 3)
+    for x in range(width):
+        rgb = fill.at(x0 + x, y)
+        j = x * 3
+        row[j  ] = (rgb >> 16) & 255
+        row[j+1] = (rgb >> 8) & 255
+        row[j+2] = rgb & 255
+    return bytes(row)
+
+class Gradient:
+    """
+    linear gradient of colors along (x1, y1)-(x2, y2), compiled once
+    into a lookup table of packed rgb values for integer pixel coordinates
+    """
+    __slots__ = ('solid', 'vertical', '_axis', '_table', '_n', '_x1', '_y1', '_dx', '_dy', '_f')
+
+    def __init__(self, colors, x1, y1, x2, y2):
+        dx = x2 - x1
+        dy = y2 - y1
+        self._x1 = x1
+        self._y1 = y1
+        self._dx = dx
+        self._dy = dy
+        self._f = 2*dx*dy
+        if (1 == len(colors)) or ((0 == dx) and (0 == dy)):
+            # solid color
+            self._axis = 0
+            self._table = (packRGB(colorAt(x1, y1, colors, x1, y1, x2, y2)),)
+        elif (0 == dy) and (0 < dx) and (int(dx) == dx) and (int(x1) == x1):
+            # horizontal, one entry per pixel column
+            self._axis = 1
+            self._table = tuple(packRGB(colorAt(x1 + i, y1, colors, x1, y1, x2, y2)) for i in range(int(dx) + 1))
+        elif (0 == dx) and (0 < dy) and (int(dy) == dy) and (int(y1) == y1):
+            # vertical, one entry per pixel row
+            self._axis = 2
+            self._table = tuple(packRGB(colorAt(x1, y1 + i, colors, x1, y1, x2, y2)) for i in range(int(dy) + 1))
+        else:
+            # any other axis, 256 entries along the gradient
+            self._axis = 3
+            self._table = tuple(packRGB(gradientAt(i / 255.0, colors)) for i in range(256))
+        self._n = len(self._table) - 1
+        self.solid = 0 == self._axis
+        self.vertical = 2 <= self._axis
+
+    def at(self, x, y):
+        axis = self._axis
+        if 0 == axis:
+            return self._table[0]
+        if 1 == axis:
+            i = x - self._x1
+        elif 2 == axis:
+            i = y - self._y1
+        else:
+            px = x - self._x1
+            py = y - self._y1
+            t = py/self._dy if 0 == self._dx else (px/self._dx if 0 == self._dy else (px*self._dy + py*self._dx)/self._f)
+            i = round(t * 255)
+        return self._table[0 if 0 > i else (self._n if self._n < i else int(i))]
+
+    def fill_row(self, y, x0, width):
+        return rgbRow(self, y, x0, width)
+
+    def fill_plane(self, np, x0, y0, width, height):
+        # rgb pixels of a rectangle as a numpy array, the same as at() for each pixel
+        x = np.arange(x0, x0 + width)[None, :]
+        y = np.arange(y0, y0 + height)[:, None]
+        axis = self._axis
+        if 0 == axis:
+            i = np.zeros((height, width))
+        elif 1 == axis:
+            i = np.broadcast_to(x - self._x1, (height, width))
+        elif 2 == axis:
+            i = np.broadcast_to(y - self._y1, (height, width))
+        else:
+            px = x - self._x1
+            py = y - self._y1
+            t = np.broadcast_to(py/self._dy, (height, width)) if 0 == self._dx else (np.broadcast_to(px/self._dx, (height, width)) if 0 == self._dy else (px*self._dy + py*self._dx)/self._f)
+            i = np.round(t * 255)
+        rgb = np.array(self._table, dtype=np.uint32)[np.clip(i, 0, self._n).astype(np.intp)]
+        return np.stack(((rgb >> 16) & 255, (rgb >> 8) & 255, rgb & 255), axis=-1).astype(np.uint8)
+
+class PixelFill:
+    """
+    adapter for colors given as a callable(x, y) returning [r, g, b],
+    called once per pixel
+    """
+    __slots__ = ('solid', 'vertical', '_colors')
+
+    def __init__(self, colors):
+        self.solid = False
+        self.vertical = True
+        self._colors = colors
+
+    def at(self, x, y):
+        return packRGB(self._colors(x, y))
+
+    def fill_row(self, y, x0, width):
+        return rgbRow(self, y, x0, width)
+
+class RowFill:
+    """
+    adapter for colors given as an object with fill_row(y, x0, width) returning
+    the rgb or rgba bytes of width pixels of row y, rows are requested once
+    for the [x1, x2] span of the fill and reused for every pixel in it
+    """
+    __slots__ = ('solid', 'vertical', '_colors', '_x0', '_width', '_rows')
+
+    def __init__(self, colors, x1, x2):
+        self.solid = False
+        self.vertical = True
+        self._colors = colors
+        self._x0 = math.floor(min(x1, x2))
+        self._width = math.ceil(max(x1, x2)) - self._x0 + 1
+        self._rows = {}
+
+    def at(self, x, y):
+        row = self._rows.get(y)
+        if row is None: row = self._rows[y] = self.fill_row(y, self._x0, self._width)
+        j = (x - self._x0) * 3
+        if not (0 <= j < len(row)):
+            row = self.fill_row(y, x, 1)
+            j = 0
+        return (row[j] << 16) | (row[j+1] << 8) | row[j+2]
+
+    def fill_row(self, y, x0, width):
+        row = self._colors.fill_row(y, x0, width)
+        if len(row) == (width << 2):
+            # rgba to rgb, the canvas is opaque
+            rgba = memoryview(row)
+            row = bytearray(width * 3)
+            row[0::3] = rgba[0::4]
+            row[1::3] = rgba[1::4]
+            row[2::3] = rgba[2::4]
+        return bytes(row)
+
+class Tile:
+    """
+    image tile of rgba pixels, repeated in both directions starting from an offset,
+    stored as rgb rows since the canvas is opaque
+    """
+    __slots__ = ('solid', 'vertical', '_rows', '_width', '_height', '_ox', '_oy')
+
+    def __init__(self, pattern, ox=0, oy=0):
+        self.solid = False
+        self.vertical = True
+        self._width = int(pattern['width'])
+        self._height = int(pattern['height'])
+        self._ox = ox
+        self._oy = oy
+        rgba = memoryview(bytes(pattern['image']))
+        image = bytearray(self._width * self._height * 3)
+        image[0::3] = rgba[0::4]
+        image[1::3] = rgba[1::4]
+        image[2::3] = rgba[2::4]
+        stride = self._width * 3
+        self._rows = tuple(bytes(image[y*stride:(y+1)*stride]) for y in range(self._height))
+
+    def at(self, x, y):
+        row = self._rows[(y + self._oy) % self._height]
+        j = ((x + self._ox) % self._width) * 3
+        return (row[j] << 16) | (row[j+1] << 8) | row[j+2]
+
+    def fill_row(self, y, x0, width):
+        row = self._rows[(y + self._oy) % self._height]
+        start = ((x0 + self._ox) % self._width) * 3
+        end = start + width * 3
+        if end <= len(row): return row[start:end]
+        return (row[start:] + row * (1 + (end - len(row)) // len(row)))[:width * 3]
+
+# compiled gradients, keyed by (colors, x1, y1, x2, y2)
+gradients = LRUCache(256)
+
+def colorFill(colors, x1, y1, x2, y2):
+    if isinstance(colors, Tile): return colors
+    if hasattr(colors, 'fill_row'): return RowFill(colors, x1, x2)
+    if callable(colors): return PixelFill(colors)
+    return gradients.get((tuple(colors), x1, y1, x2, y2), lambda: Gradient(colors, x1, y1, x2, y2))
+
+def isGray(colors):
+    return isinstance(colors, list) and all((((c >> 16) & 255) == (c & 255)) and (((c >> 8) & 255) == (c & 255)) for c in colors)
+
+def backgroundPlane(background, w, h, bpp=3):
+    # rgb pixels of the background, or the single channel of gray pixels
+    fill = colorFill(background, 0, h/2, w-1, h/2)
+    if not fill.vertical: return fill.fill_row(0, 0, w)[::3 if 1 == bpp else 1] * h
+    return b''.join(fill.fill_row(y, 0, w)[::3 if 1 == bpp else 1] for y in range(h))
+
+# rendered backgrounds, keyed by (background, w, h, bpp)
+backgrounds = LRUCache(64, 4 * 1024 * 1024)
+
+# glyph index of each renderable char
+GLYPH_CHARS = '0123456789+-×÷=?'
+GLYPH_INDEX = {c: i for i, c in enumerate(GLYPH_CHARS)}
+
+class Glyph:
+    __slots__ = ('offset', 'width', 'height', 'ink', 'bbox', 'spans')
+
+    def __init__(self, offset, width, height, ink):
+        self.offset = offset
+        self.width = width
+        self.height = height
+        self.ink = ink
+        # (x, y, width, height) of the inked pixels in the glyph cell
+        pixels = list(struct.iter_unpack('BBB', ink))
+        if pixels:
+            x1 = min(p[0] for p in pixels)
+            y1 = min(p[1] for p in pixels)
+            self.bbox = (x1, y1, max(p[0] for p in pixels) - x1 + 1, max(p[1] for p in pixels) - y1 + 1)
+        else:
+            self.bbox = (0, 0, 0, 0)
+        # packed (x, y, length, alpha) spans of the inked pixels, row by row,
+        # horizontal runs of opaque pixels are merged into a single span
+        spans = []
+        for x, y, alpha in pixels:
+            if (255 == alpha) and spans and (255 == spans[-1][3]) and (y == spans[-1][1]) and (x == spans[-1][0] + spans[-1][2]):
+                spans[-1][2] += 1
+            else:
+                spans.append([x, y, 1, alpha])
+        self.spans = b''.join(struct.pack('BBBB', *span) for span in spans)
+
+class GlyphAtlas:
+    """
+    immutable glyph atlas, shared by all SimpleCaptcha instances,
+    all glyph coverage values are stored contiguously in a single bytes object
+    """
+    __slots__ = ('_fontSize', '_width', '_height', '_data', '_glyphs')
+
+    def __init__(self, data):
+        # data is fontSize, cell width, cell height, number of glyphs,
+        # then the (width, height) of each glyph, then the cell coverage of each glyph
+        self._fontSize, self._width, self._height, n = struct.unpack_from('!BBBB', data, 0)
+        size = self._width * self._height
+        start = 4 + 2*n
+        self._data = bytes(data[start:start + n*size])
+        glyphs = []
+        for i in range(n):
+            offset = i*size
+            # sparse coverage, packed (x, y, alpha) of inked pixels of the glyph cell only
+            ink = bytes(v for j, alpha in enumerate(self._data[offset:offset+size]) if 0 < alpha for v in (j % self._width, j // self._width, alpha))
+            glyphs.append(Glyph(offset, data[4 + 2*i], data[5 + 2*i], ink))
+        self._glyphs = tuple(glyphs)
+
+    def metrics(self):
+        return {
+            'fontSize': self._fontSize,
+            'width': self._width,
+            'height': self._height
+        }
+
+    def get_glyph(self, char):
+        # char is either a glyph index or the char itself
+        return self._glyphs[GLYPH_INDEX[char] if isinstance(char, str) else char]
+
+    def coverage(self):
+        return memoryview(self._data)
+
+_glyphAtlas = None
+_glyphAtlasLock = threading.Lock()
+
+def glyphAtlas():
+    # build the glyph atlas lazily, once per process
+    global _glyphAtlas
+    if _glyphAtlas is None:
+        with _glyphAtlasLock:
+            if _glyphAtlas is None:
+                _glyphAtlas = GlyphAtlas(zlib.decompress(base64.b64decode(_GLYPH_DATA)))
+    return _glyphAtlas
+
+# glyphs resampled for scale distortion, keyed by (glyph, scale, cell column), the scale takes
+# only a few values (of the phase and the position of the glyph), so it is not quantized
+scaledGlyphs = LRUCache(1024)
+
+def scaleGlyph(glyph, scale, xk, cw, ch):
+    # packed (xs, ys, alpha) of the inked pixels of a glyph cell resampled at scale,
+    # each scaled pixel (xs, ys) samples glyph pixel (round(xk + xs/scale) - xk, round(10 + ys/scale) - 10)
+    # of the glyph cell at (xk, 10), so that halves are rounded as in the glyph cell of the canvas
+    sw = round(scale * cw)
+    sh = round(scale * ch)
+    xs_of = [[] for x in range(cw)]
+    ys_of = [[] for y in range(ch)]
+    for xs in range(sw):
+        x = round(xk + xs / scale) - xk
+        if x < cw: xs_of[x].append(xs)
+    for ys in range(sh):
+        y = round(10 + ys / scale) - 10
+        if y < ch: ys_of[y].append(ys)
+    ink = b''.join(struct.pack('<HHB', xs, ys, alpha) for x, y, alpha in struct.iter_unpack('BBB', glyph.ink) for ys in ys_of[y] for xs in xs_of[x])
+    return (sw, sh, ink)
+
+# distortion_type of scale distortion, 0 is no distortion and the others are warps
+SCALE_DISTORTION = 2
+
+# warps displace each canvas column vertically, so that canvas pixel (x, y)
+# shows the text pixel at (x, y + dy[x]), keyed by distortion_type,
+# a warp(w, amplitude, phase) returns the w column displacements
+def waveWarp(w, amplitude, phase):
+    return tuple(round(amplitude * math.sin(phase + 6.28 * 2.0 * x / w)) for x in range(w))
+
+WARPS = {
+    1: waveWarp
+}
+
+def distortionType(distortion_type):
+    # distortion_type clamped to the range of the scale distortion and the registered warps
+    return min(max([SCALE_DISTORTION] + list(WARPS)), max(0, int(distortion_type)))
+
+# column displacements of each warp, keyed by (warp function, w, amplitude, phase)
+warpTables = LRUCache(256)
+
+def warpTable(distortion_type, w, amplitude, phase):
+    warp = WARPS[distortion_type]
+    return warpTables.get((warp, w, amplitude, phase), lambda: warp(w, amplitude, phase))
+
+# glyph atlas data, zlib-compressed and base64-encoded, decoded on first render
+_GLYPH_DATA = (
+    b'eNrFVltuAyEMRP3oc6X0owfhRFzI9/FxfBWXxRgPu6RtpEQlEjsCYwZ7MPnaLp/bZfF7f3na3j5e'
+    b't+ftklISVZXU2g5r22FpH1GqPWuufVZuI92ydn1Zm74Vox/zb9O4b9Lg08ml0cyiz1BAx9XRGBfN'
+    b'Bez/B+/0uaEM5zKO1tt09mykCHEa8bdGWmIDDigLyAElbDmg09kJFcA95hT0+wGofbRlzfJIcGLg'
+    b'lkfCSIMFzYkseF4xKZw003VCY/ezNjgtE6CBKXAN5sDCw55CKLl+HYsMn7STMpxbXzopb3nCfxNH'
+    b'jzrZqQMLKoFBCeiijPtLEBPu5Bhjm+bY/hzngndQznGOfZ1zyJG7quNeH+j72pr8sbbYWMtv0agP'
+    b'foidZ57qiflvnCnWTnXMosIgYcvLKUeoYbyCECmMJgj1ysXEeKMJCgDTgOmZUzViLpELjLNtansg'
+    b'xpGusQL54ji1eUMNLOp2O7JrQyCgeTgV4EzIGeqG8fH6L7jXcV/Ffe28bbOuSU9/tWMMnhzeLNOG'
+    b'qzGul62NhGG7UoSXWFxLPONb/TymiR4ExOk/m7QscEn+hPi9q1kk55aRJjwQOA726Af9P6idiudp'
+    b'Ph5Rnh/Um/zcVQFd9YjvZX9npvh/o91O7rf4WB/OoSP8g7P6B4SVHWs16e+CWdl/A+hsB9Q='
+)
+
+
+# PNG utilities
+PNG_SIGNATURE = b"\x89\x50\x4e\x47\x0d\x0a\x1a\x0a"
+
+# color-type bits
+COLORTYPE_GRAYSCALE = 0
+COLORTYPE_PALETTE = 1
+COLORTYPE_COLOR = 2
+COLORTYPE_ALPHA = 4 # e.g. grayscale and alpha
+
+# color-type combinations
+COLORTYPE_PALETTE_COLOR = 3
+COLORTYPE_COLOR_ALPHA = 6
+
+COLORTYPE_TO_BPP_MAP = {
+    '0': 1,
+    '2': 3,
+    '3': 1,
+    '4': 2,
+    '6': 4
+}
+
+GAMMA_DIVISION = 100000
+
+# palette index of each pixel shifted into its place in a byte, keyed by bit depth,
+# indexed by the position of the pixel in the byte
+PACK_SHIFTS = {
+    depth: tuple(bytes((v << (8 - depth*(i+1))) & 255 for v in range(256)) for i in range(8 // depth))
+    for depth in (1, 2, 4)
+}
+
+def quantizeTable(bits):
+    # channel values reduced to 2^bits evenly spaced levels
+    shift = 8 - bits
+    return bytes(round((v >> shift) * 255 / (255 >> shift)) for v in range(256))
+
+def clamp(value):
+    return max(0, min(255, round(value)))
+
+def paethPredictor(left, above, upLeft):
+    paeth = left + above - upLeft
+    pLeft = abs(paeth - left)
+    pAbove = abs(paeth - above)
+    pUpLeft = abs(paeth - upLeft)
+
+    if pLeft <= pAbove and pLeft <= pUpLeft: return left
+    if pAbove <= pUpLeft: return above
+    return upLeft
+
+# filtered rows are scored by the sum of their bytes taken as signed magnitudes (as libpng does),
+# the filter with the lowest score is selected for each row in adaptive filtering
+FILTER_SCORE = bytes(min(v, 256 - v) for v in range(256))
+
+# swar masks of the high bit and the low 7 bits of every byte of a row, keyed by row byte width
+_swarMasks = {}
+
+def swarMasks(byteWidth):
+    masks = _swarMasks.get(byteWidth)
+    if masks is None:
+        high = int.from_bytes(b'\x80' * byteWidth, 'big')
+        low = int.from_bytes(b'\x7f' * byteWidth, 'big')
+        masks = _swarMasks[byteWidth] = (high, low, high | low, low << 1)
+    return masks
+
+def swarSub(a, b, byteWidth):
+    # bytewise (a - b) & 255 of rows packed as big ints, without borrows between bytes
+    high, low, all, even = swarMasks(byteWidth)
+    return (((a | high) - (b & low)) ^ ((a ^ b ^ all) & high)).to_bytes(byteWidth, 'big')
+
+def swarAvg(a, b, byteWidth):
+    # bytewise (a + b) >> 1 of rows packed as big ints, without carries between bytes
+    high, low, all, even = swarMasks(byteWidth)
+    return (a & b) + (((a ^ b) & even) >> 1)
+
+def filterNone(pxData, pxPos, byteWidth, rawData, rawPos, bpp):
+    rawData[rawPos:rawPos+byteWidth] = pxData[pxPos:pxPos+byteWidth]
+
+def filterSub(pxData, pxPos, byteWidth, rawData, rawPos, bpp):
+    row = int.from_bytes(pxData[pxPos:pxPos+byteWidth], 'big')
+    rawData[rawPos:rawPos+byteWidth] = swarSub(row, row >> (bpp << 3), byteWidth)
+
+def filterUp(pxData, pxPos, byteWidth, rawData, rawPos, bpp):
+    row = int.from_bytes(pxData[pxPos:pxPos+byteWidth], 'big')
+    up = int.from_bytes(pxData[pxPos-byteWidth:pxPos], 'big') if pxPos > 0 else 0
+    rawData[rawPos:rawPos+byteWidth] = swarSub(row, up, byteWidth)
+
+def filterAvg(pxData, pxPos, byteWidth, rawData, rawPos, bpp):
+    row = int.from_bytes(pxData[pxPos:pxPos+byteWidth], 'big')
+    up = int.from_bytes(pxData[pxPos-byteWidth:pxPos], 'big') if pxPos > 0 else 0
+    rawData[rawPos:rawPos+byteWidth] = swarSub(row, swarAvg(row >> (bpp << 3), up, byteWidth), byteWidth)
+
+def filterPaeth(pxData, pxPos, byteWidth, rawData, rawPos, bpp):
+    for x in range(byteWidth):
+        left = pxData[pxPos + x - bpp] if x >= bpp else 0
+        up = pxData[pxPos + x - byteWidth] if pxPos > 0 else 0
+        upleft = pxData[pxPos + x - (byteWidth + bpp)] if pxPos > 0 and x >= bpp else 0
+        val = pxData[pxPos + x] - paethPredictor(left, up, upleft)
+        rawData[rawPos + x] = ubyte(val)
+
+def filterSum(rawData, rawPos, byteWidth):
+    return sum(rawData[rawPos:rawPos+byteWidth].translate(FILTER_SCORE))
+
+def numpyFilter(np, pxData, width, height, bpp, filterTypes):
+    # all rows filtered at once with every filter type, and the best one selected for each row
+    byteWidth = width * bpp
+    px = np.frombuffer(pxData, dtype=np.uint8).reshape(height, byteWidth).astype(np.int16)
+    left = np.zeros_like(px)
+    left[:, bpp:] = px[:, :-bpp]
+    up = np.zeros_like(px)
+    up[1:] = px[:-1]
+    upleft = np.zeros_like(px)
+    upleft[1:, bpp:] = px[:-1, :-bpp]
+    predictors = []
+    for filterType in filterTypes:
+        if 0 == filterType:
+            predictors.append(0)
+        elif 1 == filterType:
+            predictors.append(left)
+        elif 2 == filterType:
+            predictors.append(up)
+        elif 3 == filterType:
+            predictors.append((left + up) >> 1)
+        else:
+            paeth = left + up - upleft
+            pLeft = np.abs(paeth - left)
+            pAbove = np.abs(paeth - up)
+            pUpLeft = np.abs(paeth - upleft)
+            predictors.append(np.where((pLeft <= pAbove) & (pLeft <= pUpLeft), left, np.where(pAbove <= pUpLeft, up, upleft)))
+    filtered = np.stack([(px - predictor) & 255 for predictor in predictors]).astype(np.uint8)
+    rows = np.arange(height)
+    if 1 < len(filterTypes):
+        sel = np.argmin(np.frombuffer(FILTER_SCORE, dtype=np.uint8)[filtered].sum(axis=2, dtype=np.int64), axis=0)
+    else:
+        sel = np.zeros(height, dtype=np.intp)
+    rawData = np.empty((height, byteWidth + 1), dtype=np.uint8)
+    rawData[:, 0] = np.array(filterTypes, dtype=np.uint8)[sel]
+    rawData[:, 1:] = filtered[sel, rows]
+    return bytearray(rawData.tobytes())
+
+
+def deflate(data, compressionLevel=-1, chunkSize=None, strategy=zlib.Z_DEFAULT_STRATEGY, memLevel=zlib.DEF_MEM_LEVEL, windowBits=zlib.MAX_WBITS):
+    # data is fed to the compressor chunkSize bytes at a time
+    compressor = zlib.compressobj(compressionLevel, zlib.DEFLATED, windowBits, memLevel, strategy)
+    data = memoryview(data)
+    chunkSize = max(1, len(data)) if not chunkSize else chunkSize
+    zdata = b''.join(compressor.compress(data[i:i+chunkSize]) for i in range(0, len(data), chunkSize))
+    zdata += compressor.flush()
+    return zdata
+
+def crc32(data):
+    return zlib.crc32(data)
+
+def ubyte(value):
+    return value & 255
+
+def I1(value):
+    return struct.pack('!B', value & 255)
+
+def I4(value):
+    return struct.pack('!I', value & 0xffffffff)
+
+def i4(value):
+    return struct.pack('!i', value)
+
+# named sets of encoder options, measured on typical captchas with bench.py,
+# no filtering compresses best for the flat colors of captchas
+PNG_PRESETS = {
+    'fastest': {'deflateLevel': 1, 'deflateStrategy': zlib.Z_DEFAULT_STRATEGY, 'filterType': 0},
+    'balanced': {'deflateLevel': 6, 'deflateStrategy': zlib.Z_DEFAULT_STRATEGY, 'filterType': 0},
+    'smallest': {'deflateLevel': 9, 'deflateStrategy': zlib.Z_DEFAULT_STRATEGY, 'deflateMemLevel': 9, 'filterType': 0}
+}
+
+class PNGPacker:
+    def __init__(self, options=None):
+        # options may start from a named preset, explicit options override it
+        options = dict(options) if options else {}
+        if 'preset' in options:
+            if not (options['preset'] in PNG_PRESETS):
+                raise Exception('unrecognised png preset:' + str(options['preset']))
+            preset = dict(PNG_PRESETS[options['preset']])
+            preset.update(options)
+            options = preset
+        options['deflateChunkSize'] = max(1024, int(options['deflateChunkSize'] if ('deflateChunkSize' in options) else 32 * 1024))
+        options['deflateLevel'] = min(9, max(0, int(options['deflateLevel'] if ('deflateLevel' in options) else 9)))
+        options['deflateStrategy'] = min(4, max(0, int(options['deflateStrategy'] if ('deflateStrategy' in options) else zlib.Z_DEFAULT_STRATEGY)))
+        options['deflateMemLevel'] = min(9, max(1, int(options['deflateMemLevel'] if ('deflateMemLevel' in options) else zlib.DEF_MEM_LEVEL)))
+        options['deflateWindowBits'] = min(15, max(9, int(options['deflateWindowBits'] if ('deflateWindowBits' in options) else zlib.MAX_WBITS)))
+        options['bitDepth'] = 8 #int(options['bitDepth'] if 'bitDepth' in options else 8)
+        # captchas are opaque rgb by default, or gray when their pixels are single gray values
+        self._grayByDefault = not ('colorType' in options)
+        options['colorType'] = min(6, max(0, int(options['colorType'] if ('colorType' in options) else COLORTYPE_COLOR)))
+
+        options['quantize'] = bool(options['quantize'] if ('quantize' in options) else False)
+
+        if not (options['colorType'] in (COLORTYPE_GRAYSCALE, COLORTYPE_COLOR, COLORTYPE_PALETTE_COLOR, COLORTYPE_COLOR_ALPHA)):
+            raise Exception('option color type:' + str(options['colorType']) + ' is not supported at present')
+
+       #if options['bitDepth'] != 8:
+       #    raise Exception('option bit depth:' + str(options['bitDepth']) + ' is not supported at present')
+        self._options = options
+
+    def toPNG(self, data, width, height):
+        if self._grayByDefault and (COLORTYPE_GRAYSCALE != self._options['colorType']) and (len(data) == width * height):
+            return PNGPacker(dict(self._options, colorType=COLORTYPE_GRAYSCALE)).toPNG(data, width, height)
+
+        palette = None
+        bitDepth = self._options['bitDepth']
+        if COLORTYPE_PALETTE_COLOR == self._options['colorType']:
+            indexed = self._palettePack(data, width, height)
+            if indexed is None:
+                # too many colors for a palette
+                return PNGPacker(dict(self._options, colorType=COLORTYPE_COLOR)).toPNG(data, width, height)
+            palette, data, bitDepth = indexed
+
+        # Signature
+        png = PNG_SIGNATURE
+
+        # Header
+        png += self.packIHDR(width, height, bitDepth)
+
+        # gAMA
+        if 'gamma' in self._options:
+            png += self.packGAMA(self._options['gamma'])
+
+        # Palette
+        if palette is not None:
+            png += self.packPLTE(palette)
+
+        # filter data, palette indices are already packed in rows of whole bytes
+        filteredData = self.filterData(data, width, height) if palette is None else self._filter(data, len(data) // height, height)
+
+        # compress data
+        deflateOpts = self.getDeflateOptions()
+        compressedData = deflate(filteredData, deflateOpts['level'], deflateOpts['chunkSize'], deflateOpts['strategy'], deflateOpts['memLevel'], deflateOpts['windowBits'])
+        filteredData = None
+
+        # Data
+        png += self.packIDAT(compressedData)
+        compressedData = None
+
+        # End
+        png += self.packIEND()
+
+        return png
+
+    def getDeflateOptions(self):
+        return {
+            'chunkSize': self._options['deflateChunkSize'],
+            'level': self._options['deflateLevel'],
+            'strategy': self._options['deflateStrategy'],
+            'memLevel': self._options['deflateMemLevel'],
+            'windowBits': self._options['deflateWindowBits']
+        }
+
+    def filterData(self, data, width, height):
+        # convert to correct format for filtering (e.g. right bpp and bit depth)
+        # and filter pixel data
+        return self._filter(self._bitPack(data, width, height), width, height)
+
+    def packIHDR(self, width, height, bitDepth=None):
+        IHDR = I4(width) + I4(height)
+        IHDR += I1(self._options['bitDepth'] if bitDepth is None else bitDepth) # bit depth
+        IHDR += I1(self._options['colorType']) # color type
+        IHDR += I1(0) # compression
+        IHDR += I1(0) # filter
+        IHDR += I1(0) # interlace
+        return self._packChunk('IHDR', IHDR)
+
+    def packGAMA(self, gamma):
+        return self._packChunk('gAMA', I4(math.floor(float(gamma) * GAMMA_DIVISION)))
+
+    def packPLTE(self, palette):
+        return self._packChunk('PLTE', palette)
+
+    def packIDAT(self, data):
+        return self._packChunk('IDAT', data)
+
+    def packIEND(self):
+        return self._packChunk('IEND', None)
+
+    def _bitPack(self, data, width, height):
+        # input pixels are gray, rgb or rgba, as given by the size of data,
+        # output pixels are gray, rgb (also before palette indexing) or rgba
+        n = width * height
+        inBpp = len(data) // n if 0 < n else 3
+        colorType = self._options['colorType']
+        outBpp = 1 if COLORTYPE_GRAYSCALE == colorType else (4 if COLORTYPE_COLOR_ALPHA == colorType else 3)
+
+        if inBpp == outBpp: return data
+
+        data = memoryview(data)
+
+        if 1 == inBpp:
+            # gray to rgb or opaque rgba
+            outData = bytearray(n * outBpp)
+            outData[0::outBpp] = data
+            outData[1::outBpp] = data
+            outData[2::outBpp] = data
+            if 4 == outBpp: outData[3::4] = b'\xff' * n
+            return outData
+
+        if 3 == inBpp and 4 == outBpp:
+            # rgb to opaque rgba
+            outData = bytearray(n << 2)
+            outData[0::4] = data[0::3]
+            outData[1::4] = data[1::3]
+            outData[2::4] = data[2::3]
+            outData[3::4] = b'\xff' * n
+            return outData
+
+        if 4 == inBpp:
+            # rgba to rgb
+            outData = bytearray(n * 3)
+            outData[0::3] = data[0::4]
+            outData[1::3] = data[1::4]
+            outData[2::3] = data[2::4]
+            if bytes(data[3::4]).count(255) < n:
+                # composite translucent pixels over background color
+                bgColor = self._options['bgColor'] if 'bgColor' in self._options else {}
+                bgRed = clamp(bgColor['red'] if 'red' in bgColor else 255)
+                bgGreen = clamp(bgColor['green'] if 'green' in bgColor else 255)
+                bgBlue = clamp(bgColor['blue'] if 'blue' in bgColor else 255)
+
+                outIndex = 0
+                for inIndex in range(3, n << 2, 4):
+                    alpha = data[inIndex]
+                    if 255 > alpha:
+                        alpha = float(alpha) / 255.0
+                        outData[outIndex] = clamp((1 - alpha) * bgRed + alpha * outData[outIndex])
+                        outData[outIndex + 1] = clamp((1 - alpha) * bgGreen + alpha * outData[outIndex + 1])
+                        outData[outIndex + 2] = clamp((1 - alpha) * bgBlue + alpha * outData[outIndex + 2])
+                    outIndex += 3
+            if 3 == outBpp: return outData
+            data = memoryview(outData)
+
+        # rgb to gray, only for gray pixels
+        if not (data[0::3] == data[1::3] == data[2::3]):
+            raise Exception('grayscale output of a color image is not supported')
+        return bytes(data[0::3])
+
+    def _palettePack(self, data, width, height):
+        # palette of the distinct rgb colors and the palette index of each pixel,
+        # packed at the smallest bit depth that fits the palette,
+        # colors are quantized to fewer levels until they fit if quantize is set, else None
+        n = width * height
+        rgb = memoryview(self._bitPack(data, width, height))
+        bits = 8
+        while True:
+            px = rgb if 8 == bits else bytes(rgb).translate(quantizeTable(bits))
+            # one native int per pixel, hashed and compared at C speed
+            rgbx = bytearray(n << 2)
+            rgbx[0::4] = px[0::3]
+            rgbx[1::4] = px[1::3]
+            rgbx[2::4] = px[2::3]
+            pixels = memoryview(rgbx).cast('I')
+            colors = dict.fromkeys(pixels)
+            if len(colors) <= 256: break
+            if (not self._options['quantize']) or (1 == bits): return None
+            bits -= 1
+
+        palette = b''.join(struct.pack('=I', color)[:3] for color in colors)
+        for i, color in enumerate(colors): colors[color] = i
+        indices = bytes(map(colors.__getitem__, pixels))
+
+        k = len(colors)
+        bitDepth = 1 if k <= 2 else (2 if k <= 4 else (4 if k <= 16 else 8))
+        if 8 == bitDepth: return (palette, indices, bitDepth)
+
+        # rows padded to whole bytes, then the indices of each byte are shifted in place and or-ed together
+        perByte = 8 // bitDepth
+        rowBytes = (width + perByte - 1) // perByte
+        pad = bytes(rowBytes * perByte - width)
+        if pad: indices = b''.join(indices[y*width:(y+1)*width] + pad for y in range(height))
+        packed = 0
+        for i, shifts in enumerate(PACK_SHIFTS[bitDepth]):
+            packed |= int.from_bytes(indices[i::perByte].translate(shifts), 'big')
+        return (palette, packed.to_bytes(rowBytes * height, 'big'), bitDepth)
+
+    def _filter(self, pxData, width, height):
+        filters = [
+          filterNone,
+          filterSub,
+          filterUp,
+          filterAvg,
+          filterPaeth
+        ]
+
+        filterType = self._options['filterType'] if 'filterType' in self._options else 0 # no filtering by default
+        if isinstance(filterType, (list, tuple)) and filterType and all(0 <= int(t) <= 4 for t in filterType):
+            filterTypes = [int(t) for t in filterType]
+        elif -1 == filterType:
+            # adaptive, paeth has no bytes-level version and is tried only with numpy
+            filterTypes = [0, 1, 2, 3, 4] if self._numpy() is not None else [0, 1, 2, 3]
+        elif (not isinstance(filterType, (list, tuple))) and (int(filterType) == filterType) and (0 <= filterType <= 4):
+            filterTypes = [int(filterType)]
+        else:
+            raise Exception('unrecognised filter types')
+
+        bpp = COLORTYPE_TO_BPP_MAP[str(self._options['colorType'])]
+        byteWidth = width * bpp
+        rawPos = 0
+        pxPos = 0
+        sel = filterTypes[0]
+        n = len(filterTypes)
+
+        if (1 < n) or (0 != sel):
+            np = self._numpy()
+            if np is not None: return numpyFilter(np, pxData, width, height, bpp, filterTypes)
+
+        rawData = bytearray((byteWidth + 1) * height)
+        pxData = memoryview(pxData)
+
+        if (1 == n) and (0 == sel):
+            # no filtering, rows are copied after their (zero) filter type byte
+            for y in range(height):
+                rawData[rawPos + 1:rawPos + 1 + byteWidth] = pxData[pxPos:pxPos + byteWidth]
+                rawPos += byteWidth + 1
+                pxPos += byteWidth
+            return rawData
+
+        for y in range(height):
+            rawData[rawPos] = sel
+            rawPos += 1
+            if n > 1:
+                # find best filter for this line (with lowest score of filtered values)
+                best = None
+                min = math.inf
+                for i in range(n):
+                    filters[filterTypes[i]](pxData, pxPos, byteWidth, rawData, rawPos, bpp)
+                    sum = filterSum(rawData, rawPos, byteWidth)
+                    if sum < min:
+                        sel = filterTypes[i]
+                        min = sum
+                        best = rawData[rawPos:rawPos+byteWidth]
+                rawData[rawPos - 1] = sel
+                rawData[rawPos:rawPos+byteWidth] = best
+            else:
+                filters[sel](pxData, pxPos, byteWidth, rawData, rawPos, bpp)
+            rawPos += byteWidth
+            pxPos += byteWidth
+        return rawData
+
+    def _numpy(self):
+        # numpy filtering only with the numpy backend
+        return numpy() if 'numpy' == self._options.get('backend') else None
+
+    def _packChunk(self, type, data = None):
+        block = str(type).encode('ascii')
+        length = 0
+        if data is not None:
+            if isinstance(data, list): data = bytes(data)
+            length = len(data)
+            block += bytes(data)
+        return I4(length) + block + I4(crc32(block))
+
+
+__all__ = ['image', 'imagepng', 'PNGPacker', 'glyphAtlas']
\ No newline at end of file
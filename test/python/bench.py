@@ -0,0 +1,226 @@
+import os, sys, time, random, marshal, shutil, subprocess, tempfile, tracemalloc, importlib.util
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(path, name + '.py'))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+def timeit(f, n):
+    t = time.perf_counter()
+    for i in range(n): f()
+    return (time.perf_counter() - t) * 1000.0 / n
+
+def renderer(mod):
+    # glyphs, renderer and png encoder live in a lazily loaded module in newer versions
+    return mod.renderer() if hasattr(mod, 'renderer') else mod
+
+def new_atlas(mod):
+    mod = renderer(mod)
+    if hasattr(mod, '_GLYPH_DATA'):
+        return mod.GlyphAtlas(mod.zlib.decompress(mod.base64.b64decode(mod._GLYPH_DATA)))
+    return mod.GlyphAtlas(mod._chars())
+
+def bench_glyphs(mod, n=200):
+    # rebuilding the glyph data vs reusing the shared atlas
+    mod = renderer(mod)
+    if hasattr(mod, '_chars'):
+        print('  _chars() rebuild   %8.3f ms' % timeit(mod._chars, n))
+    if hasattr(mod, 'GlyphAtlas'):
+        print('  GlyphAtlas build   %8.3f ms' % timeit(lambda: new_atlas(mod), n))
+    if hasattr(mod, 'glyphAtlas'):
+        print('  glyphAtlas()       %8.3f ms' % timeit(mod.glyphAtlas, n))
+
+def retained(f):
+    tracemalloc.start()
+    obj = f()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size
+
+def bench_memory(mod):
+    mod = renderer(mod)
+    if hasattr(mod, '_chars'):
+        print('  _chars() literal   %8d bytes' % retained(mod._chars))
+    if hasattr(mod, 'GlyphAtlas'):
+        print('  GlyphAtlas         %8d bytes' % retained(lambda: new_atlas(mod)))
+
+STARTUP = {
+    'import': 'pass',
+    'import + validate()': 'SimpleCaptcha.SimpleCaptcha().validate(\'1\', \'0\' * 64)',
+    'import + generate()': 'SimpleCaptcha.SimpleCaptcha().generate()'
+}
+
+def bench_startup(path, n=10):
+    # module sizes, compile times and startup times in a fresh interpreter (with cached bytecode)
+    files = sorted(f for f in os.listdir(path) if f.endswith('.py') and f != '__init__.py')
+    for f in files:
+        with open(os.path.join(path, f), 'rb') as fp: source = fp.read()
+        t = time.perf_counter()
+        code = compile(source, f, 'exec')
+        t = (time.perf_counter() - t) * 1000.0
+        print('  %-28s %8d bytes source, %8d bytes bytecode, compile %8.3f ms' % (f, len(source), len(marshal.dumps(code)), t))
+    with tempfile.TemporaryDirectory() as tmp:
+        # the first run compiles and caches the bytecode, the following ones reuse it
+        for f in files: shutil.copy(os.path.join(path, f), tmp)
+        for label, code in STARTUP.items():
+            script = 'import sys, time; sys.path.insert(0, %r); m = len(sys.modules); t = time.perf_counter(); import SimpleCaptcha; %s; print(time.perf_counter() - t, len(sys.modules) - m)' % (tmp, code)
+            runs = [subprocess.check_output([sys.executable, '-c', script]).split() for i in range(n + 1)]
+            print('  %-28s %8.3f ms cold, %8.3f ms cached, %3d modules loaded' % (label, float(runs[0][0]) * 1000.0, min(float(r[0]) for r in runs[1:]) * 1000.0, int(runs[-1][1])))
+
+def bench_validate(mod, n=20000):
+    # validations per second, of right and wrong answers, and after every key change
+    captcha = mod.SimpleCaptcha()
+    random.seed(1)
+    captcha.generate()
+    hash = captcha.getHash()
+    right = next(a for a in range(-1000, 1000) if captcha.validate(a, hash))
+    for label, answer in [('right', right), ('wrong', 1000)]:
+        t = timeit(lambda: captcha.validate(answer, hash), n)
+        print('  validate() %-5s answer   %8.3f us, %9d per second' % (label, t * 1000.0, 1000.0 / t))
+    t = timeit(lambda: captcha.option('secret_key', 'SECRET_KEY').validate(right, hash), n)
+    print('  validate() after key set %8.3f us, %9d per second' % (t * 1000.0, 1000.0 / t))
+    if hasattr(captcha, 'hashTable'):
+        # with the precomputed answer hashes
+        captcha.option('hash_table', True)
+        t = timeit(lambda: captcha.option('secret_key', 'SECRET_KEY').hashTable(), 100)
+        table = captcha.hashTable()
+        print('  hashTable() build        %8.3f ms, %9d answers, %8d bytes' % (t, len(table), table.size()))
+        for label, answer in [('right', right), ('wrong', 1000)]:
+            t = timeit(lambda: captcha.validate(answer, hash), n)
+            print('  validate() %-5s table    %8.3f us, %9d per second' % (label, t * 1000.0, 1000.0 / t))
+        t = timeit(lambda: captcha.reset().generate(), 20)
+        print('  generate() with table    %8.3f ms' % t)
+    if hasattr(captcha, 'createToken'):
+        # expiring tokens, expired ones are rejected before their mac is computed
+        captcha.option('hash_table', False).option('token_ttl', 60)
+        for label, token in [('valid', captcha.createToken(right)), ('expired', captcha.createToken(right, time.time() - 1))]:
+            t = timeit(lambda: captcha.validate(right, token), n)
+            print('  validate() %-7s token  %8.3f us, %9d per second' % (label, t * 1000.0, 1000.0 / t))
+    if hasattr(mod, 'ReplayGuard'):
+        # single-use tokens, every validated token is added to the replay guard
+        guard = mod.ReplayGuard()
+        captcha.option('replay_guard', guard)
+        tokens = [captcha.createToken(right) for i in range(n)]
+        t = time.perf_counter()
+        for token in tokens: captcha.validate(right, token)
+        t = (time.perf_counter() - t) * 1000.0 / n
+        print('  validate() guarded token %8.3f us, %9d per second, %8d bytes guard' % (t * 1000.0, 1000.0 / t, guard.size()))
+        t = timeit(lambda: captcha.validate(right, tokens[0]), n)
+        print('  validate() replay token  %8.3f us, %9d per second' % (t * 1000.0, 1000.0 / t))
+
+def bench_keyring(mod, n=20000):
+    # validations per second with a keyring, the key is selected by the id in the hash
+    captcha = mod.SimpleCaptcha()
+    if not hasattr(captcha, 'retireKey'): return
+    for keys in [1, 4, 16]:
+        captcha.option('keyring', {'k%d' % i: 'SECRET_KEY_%d' % i for i in range(keys)}).option('key_id', 'k0')
+        random.seed(1)
+        hash = captcha.reset().getHash()
+        right = next(a for a in range(-1000, 1000) if captcha.validate(a, hash))
+        t = timeit(lambda: captcha.validate(right, hash), n)
+        print('  validate() keyring of %2d %8.3f us, %9d per second' % (keys, t * 1000.0, 1000.0 / t))
+
+def bench_generate(mod, n=20):
+    captcha = mod.SimpleCaptcha()
+    for distortion_type in range(3):
+        for difficulty in range(4):
+            captcha.option('difficulty', difficulty).option('distortion_type', distortion_type)
+            random.seed(difficulty)
+            print('  generate() difficulty %d, distortion_type %d %8.3f ms' % (difficulty, distortion_type, timeit(lambda: captcha.reset().generate(), n)))
+
+def bench_image(mod, n=20):
+    # image() only, the same formula is rendered at every difficulty, with every available backend
+    captcha = mod.SimpleCaptcha()
+    random.seed(1)
+    formula, result = captcha.formula(3, 1, 20, True, True, True, 1)
+    backends = ['python', 'numpy'] if hasattr(renderer(mod), 'numpy') and renderer(mod).numpy() else [None]
+    for backend in backends:
+        args = (backend,) if backend else ()
+        for distortion_type in range(3):
+            for difficulty in range(4):
+                random.seed(difficulty)
+                print('  image() difficulty %d, distortion_type %d    %8.3f ms %s' % (difficulty, distortion_type, timeit(lambda: captcha.image(formula, [0x121212], [0xffffff], difficulty, distortion_type, None, *args), n), backend or ''))
+
+def bench_encode(mod, n=50):
+    # png encoding of a rendered captcha, and peak memory of a whole generate()
+    captcha = mod.SimpleCaptcha()
+    random.seed(1)
+    formula, result = captcha.formula(3, 1, 20, True, True, True, 1)
+    img, w, h = captcha.image(formula, [0x121212], [0xffffff], 1, 1, None)
+    print('  filterData()       %8.3f ms' % timeit(lambda: renderer(mod).PNGPacker({}).filterData(img, w, h), n))
+    print('  imagepng()         %8.3f ms' % timeit(lambda: renderer(mod).imagepng(img, w, h), n))
+    random.seed(1)
+    captcha.reset().generate()
+    random.seed(1)
+    tracemalloc.start()
+    captcha.reset().generate()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print('  generate() peak    %8d bytes' % peak)
+
+FILTERS = [('none', 0), ('sub', 1), ('up', 2), ('avg', 3), ('paeth', 4), ('adaptive', -1)]
+
+def bench_filters(mod, n=10):
+    # png size vs encoding time of each filter strategy, over captchas with solid and gradient colors
+    if not hasattr(renderer(mod), 'filterSum'): return
+    captcha = mod.SimpleCaptcha()
+    images = []
+    for i, (color, background) in enumerate([([0x121212], [0xffffff]), ([0xff0000, 0x0000ff], [0xffffff]), ([0x121212], [0xffff00, 0x00ffff, 0xff00ff])]):
+        random.seed(i)
+        formula, result = captcha.formula(3, 1, 20, True, True, True, 1)
+        images.append(captcha.image(formula, color, background, 1 + i, 1 + i % 2, None))
+    backends = ['python', 'numpy'] if renderer(mod).numpy() else ['python']
+    for backend in backends:
+        for label, filterType in FILTERS:
+            options = {'filterType': filterType, 'backend': backend}
+            size = sum(len(renderer(mod).imagepng(img, w, h, dict(options))) for img, w, h in images)
+            t = timeit(lambda: [renderer(mod).PNGPacker(dict(options)).filterData(img, w, h) for img, w, h in images], n)
+            tz = timeit(lambda: [renderer(mod).imagepng(img, w, h, dict(options)) for img, w, h in images], n)
+            print('  filter %-8s %-6s %8d bytes, filterData() %8.3f ms, imagepng() %8.3f ms' % (label, backend, size, t, tz))
+
+def bench_presets(mod, n=20):
+    # png size vs encoding time of each compression preset, over the same captchas as bench_filters()
+    if not hasattr(renderer(mod), 'PNG_PRESETS'): return
+    captcha = mod.SimpleCaptcha()
+    images = []
+    for i, (color, background) in enumerate([([0x121212], [0xffffff]), ([0xff0000, 0x0000ff], [0xffffff]), ([0x121212], [0xffff00, 0x00ffff, 0xff00ff])]):
+        random.seed(i)
+        formula, result = captcha.formula(3, 1, 20, True, True, True, 1)
+        images.append(captcha.image(formula, color, background, 1 + i, 1 + i % 2, None))
+    for preset in [None] + sorted(renderer(mod).PNG_PRESETS):
+        options = {'preset': preset} if preset else {}
+        size = sum(len(renderer(mod).PNGPacker(options).toPNG(img, w, h)) for img, w, h in images)
+        t = timeit(lambda: [renderer(mod).PNGPacker(options).toPNG(img, w, h) for img, w, h in images], n)
+        print('  preset %-10s %8d bytes, toPNG() %8.3f ms' % (preset or 'default', size, t))
+
+def bench_caches(mod):
+    mod = renderer(mod)
+    if hasattr(mod, 'LRUCache'):
+        for name, cache in sorted(vars(mod).items()):
+            if isinstance(cache, mod.LRUCache):
+                stats = cache.stats()
+                print('  cache %-20s %6d entries, %8d bytes, %8d hits, %6d misses' % (name, stats['size'], stats.get('bytes', 0), stats['hits'], stats['misses']))
+
+def bench(path, label):
+    mod = load_module('SimpleCaptcha', path)
+    print(label + ' (SimpleCaptcha.VERSION ' + mod.SimpleCaptcha.VERSION + ')')
+    bench_startup(path)
+    bench_validate(mod)
+    bench_keyring(mod)
+    bench_glyphs(mod)
+    bench_memory(mod)
+    bench_image(mod)
+    bench_encode(mod)
+    bench_filters(mod)
+    bench_presets(mod)
+    bench_generate(mod)
+    bench_caches(mod)
+
+# usage: python bench.py [path/to/other/src/python]
+# the optional path points to another version of SimpleCaptcha.py to compare against
+bench(os.path.abspath(os.path.join(DIR, '../../src/python/')), 'current')
+if 1 < len(sys.argv):
+    bench(os.path.abspath(sys.argv[1]), sys.argv[1])
@@ -0,0 +1,450 @@
+import os, sys, json, time, random, hmac, hashlib, threading, struct, zlib, base64, importlib.util
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(path, name + '.py'))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+failed = []
+def check(label, ok):
+    print('  %-56s %s' % (label, 'ok' if ok else 'FAILED'))
+    if not ok: failed.append(label)
+
+tile = json.load(open(DIR+'/../tile.json'))
+def tile_pattern(x, y):
+    x = x % tile['width']
+    y = y % tile['height']
+    if 0 > x: x += tile['width']
+    if 0 > y: y += tile['height']
+    i = (x + y*tile['width']) << 2
+    return [tile['image'][i  ], tile['image'][i+1], tile['image'][i+2]]
+
+class TileRows:
+    # the tile pattern as rgb or rgba rows
+    def __init__(self, bpp):
+        self.bpp = bpp
+
+    def fill_row(self, y, x0, width):
+        row = bytearray()
+        for x in range(x0, x0 + width):
+            row.extend(tile_pattern(x, y))
+            if 4 == self.bpp: row.append(255)
+        return bytes(row)
+
+def check_renderer(mod):
+    # the renderer is loaded once by concurrent first uses, and registered as a module
+    renderers = []
+    threads = [threading.Thread(target=lambda: renderers.append(mod.renderer())) for i in range(16)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+    check('renderer loaded once', 16 == len(renderers) and all(renderer is renderers[0] for renderer in renderers) and renderers[0] is sys.modules.get('SimpleCaptchaRenderer'))
+
+def check_fill_row(mod):
+    # fill_row() objects render the same pixels as the equivalent callable(x, y)
+    captcha = mod.SimpleCaptcha()
+    random.seed(1)
+    formula, result = captcha.formula(3, 1, 20, True, True, True, 1)
+    for bpp in (3, 4):
+        for distortion_type in range(3):
+            for color, background in ((tile_pattern, [0xffffff]), ([0x121212], tile_pattern)):
+                random.seed(distortion_type)
+                expected = captcha.image(formula, color, background, 2, distortion_type, None)
+                color = TileRows(bpp) if callable(color) else color
+                background = TileRows(bpp) if callable(background) else background
+                random.seed(distortion_type)
+                check('fill_row() %s rows, %s, distortion_type %d' % ('rgb' if 3 == bpp else 'rgba', 'text' if isinstance(color, TileRows) else 'background', distortion_type), expected == captcha.image(formula, color, background, 2, distortion_type, None))
+
+def check_scale(mod):
+    # scaled glyphs sample the glyph pixels at the rounded canvas position, also at exact halves
+    render = mod.renderer()
+    glyphs = render.glyphAtlas()
+    cw = glyphs.metrics()['width']
+    ch = glyphs.metrics()['height']
+    glyph = glyphs.get_glyph(render.GLYPH_INDEX['8'])
+    coverage = {(x, y): alpha for x, y, alpha in render.struct.iter_unpack('BBB', glyph.ink)}
+    for scale in (0.8, 1.25, 1.5, 2.0, 1.0 + 1.0 * render.math.sin(3.14 / 2.0)):
+        for xk in (10, 11, 10 + 3 * (cw + 1)):
+            sw, sh, ink = render.scaleGlyph(glyph, scale, xk, cw, ch)
+            expected = set((xs, ys, coverage[(round(xk + xs / scale) - xk, round(10 + ys / scale) - 10)]) for xs in range(sw) for ys in range(sh) if (round(xk + xs / scale) - xk, round(10 + ys / scale) - 10) in coverage)
+            check('scaleGlyph() scale %.8f at column %d' % (scale, xk), expected == set(render.struct.iter_unpack('<HHB', ink)))
+
+def check_warps(mod):
+    # a registered warp is selected by its distortion_type, larger types are clamped to it
+    render = mod.renderer()
+    calls = []
+    def stepWarp(w, amplitude, phase):
+        calls.append((w, amplitude, phase))
+        return tuple(round(amplitude) if x % 20 < 10 else 0 for x in range(w))
+    render.WARPS[3] = stepWarp
+    try:
+        captcha = mod.SimpleCaptcha().option('difficulty', 2).option('distortion', {'2': 4.0})
+        images = {}
+        for distortion_type in (1, 3, 4):
+            random.seed(1)
+            images[distortion_type] = captcha.option('distortion_type', distortion_type).reset().getCaptcha()
+        check('registered warp selected by generate()', bool(calls) and 4.0 == calls[0][1] and images[3] != images[1] and images[3] == images[4])
+        if render.numpy():
+            random.seed(1)
+            formula, result = captcha.formula(3, 1, 20, True, True, True, 2)
+            random.seed(1)
+            expected = captcha.image(formula, [0x121212], [0xffffff], 2, 3, None, 'python')
+            random.seed(1)
+            check('registered warp with the numpy backend', expected == captcha.image(formula, [0x121212], [0xffffff], 2, 3, None, 'numpy'))
+    finally:
+        del render.WARPS[3]
+    check('distortion_type clamped to the registered types', [0, 0, 1, 2, 2] == [render.distortionType(t) for t in (-1, 0, 1, 2, 3)])
+
+def check_backends(mod):
+    # the numpy backend renders the same bytes as the python renderer
+    if not mod.renderer().numpy(): return
+    captcha = mod.SimpleCaptcha()
+    for i, (color, background) in enumerate([([0x121212], [0xffffff]), ([0xff0000, 0x0000ff], [0xffffff]), ([0x121212], tile)]):
+        random.seed(i)
+        formula, result = captcha.formula(3, 1, 20, True, True, True, 1)
+        for distortion_type in range(3):
+            for difficulty in range(4):
+                random.seed(difficulty)
+                expected = captcha.image(formula, color, background, difficulty, distortion_type, None, 'python')
+                random.seed(difficulty)
+                check('numpy backend, fill %d, difficulty %d, distortion_type %d' % (i, difficulty, distortion_type), expected == captcha.image(formula, color, background, difficulty, distortion_type, None, 'numpy'))
+
+def decodePNG(png):
+    # width, height, color type, bit depth, rgb pixels and row filter types of a png,
+    # with filters reversed as in the png specification
+    pos = 8
+    idat = b''
+    palette = None
+    while pos < len(png):
+        length, type = struct.unpack('>I4s', png[pos:pos+8])
+        data = png[pos+8:pos+8+length]
+        if zlib.crc32(type + data) != struct.unpack('>I', png[pos+8+length:pos+12+length])[0]: raise Exception('bad crc of chunk ' + str(type))
+        if b'IHDR' == type: width, height, bitDepth, colorType = struct.unpack('>IIBB', data[:10])
+        elif b'PLTE' == type: palette = data
+        elif b'IDAT' == type: idat += data
+        pos += 12 + length
+    raw = zlib.decompress(idat)
+    channels = {0: 1, 2: 3, 3: 1, 6: 4}[colorType]
+    bpp = max(1, channels * bitDepth // 8)
+    rowBytes = (width * channels * bitDepth + 7) // 8
+    prior = bytearray(rowBytes)
+    pixels = []
+    filters = []
+    for y in range(height):
+        i = y * (rowBytes + 1)
+        filter = raw[i]
+        filters.append(filter)
+        row = bytearray(raw[i+1:i+1+rowBytes])
+        for x in range(rowBytes):
+            a = row[x-bpp] if x >= bpp else 0
+            b = prior[x]
+            c = prior[x-bpp] if x >= bpp else 0
+            if 1 == filter: row[x] = (row[x] + a) & 255
+            elif 2 == filter: row[x] = (row[x] + b) & 255
+            elif 3 == filter: row[x] = (row[x] + ((a + b) >> 1)) & 255
+            elif 4 == filter:
+                p = a + b - c
+                pa = abs(p - a)
+                pb = abs(p - b)
+                pc = abs(p - c)
+                row[x] = (row[x] + (a if pa <= pb and pa <= pc else (b if pb <= pc else c))) & 255
+            elif 0 != filter: raise Exception('bad filter type ' + str(filter))
+        prior = row
+        if 8 > bitDepth:
+            perByte = 8 // bitDepth
+            values = [(row[x // perByte] >> (8 - bitDepth * (x % perByte + 1))) & ((1 << bitDepth) - 1) for x in range(width)]
+        else:
+            values = row
+        for x in range(width):
+            if 0 == colorType: pixels.append((values[x],) * 3)
+            elif 3 == colorType: pixels.append(tuple(palette[3*values[x]:3*values[x]+3]))
+            else: pixels.append(tuple(values[channels*x:channels*x+3]))
+    return (width, height, colorType, bitDepth, pixels, filters)
+
+def rgbPixels(img, width, height):
+    # rgb pixels of a gray, rgb or rgba canvas
+    bpp = len(img) // (width * height)
+    return [(img[i],) * 3 if 1 == bpp else tuple(img[i:i+3]) for i in range(0, len(img), bpp)]
+
+def testImages(mod):
+    # a gray and a color captcha, and random rgb and gray pixels of odd width, to exercise carries and borrows
+    captcha = mod.SimpleCaptcha()
+    random.seed(1)
+    formula, result = captcha.formula(3, 1, 20, True, True, True, 1)
+    rnd = random.Random(1)
+    return [
+        ('gray captcha', captcha.image(formula, [0x121212], [0xffffff], 1, 1, None)),
+        ('color captcha', captcha.image(formula, [0xff0000, 0x0000ff], [0xffff00, 0x00ffff], 2, 2, None)),
+        ('random rgb', (bytes(rnd.randrange(256) for i in range(37 * 9 * 3)), 37, 9)),
+        ('random gray', (bytes(rnd.randrange(256) for i in range(37 * 9)), 37, 9))
+    ]
+
+def check_filters(mod):
+    # every filter type, list of types and adaptive filtering decode back to the canvas pixels
+    render = mod.renderer()
+    images = testImages(mod)
+    for backend in ['python', 'numpy'] if render.numpy() else ['python']:
+        for filterType in (0, 1, 2, 3, 4, [1, 3], [0, 2, 4], -1):
+            ok = True
+            for label, (img, width, height) in images:
+                png = render.PNGPacker({'filterType': filterType, 'backend': backend}).toPNG(img, width, height)
+                w, h, colorType, bitDepth, pixels, filters = decodePNG(png)
+                types = set(filterType) if isinstance(filterType, list) else (set(range(5)) if -1 == filterType else {filterType})
+                ok = ok and (w, h) == (width, height) and pixels == rgbPixels(img, width, height) and set(filters) <= types and (1 < len(types) or set(filters) == types)
+            check('filterType %s, %s backend' % (str(filterType), backend), ok)
+
+def paletteImage(k, width, height, rnd):
+    # rgb pixels of k distinct random colors, each used at least once
+    colors = rnd.sample(range(1 << 24), k)
+    pixels = colors + [rnd.choice(colors) for i in range(width * height - k)]
+    return b''.join(c.to_bytes(3, 'big') for c in pixels)
+
+def check_palette(mod):
+    # palette pngs decode back to the canvas pixels, at the smallest bit depth of the palette
+    render = mod.renderer()
+    rnd = random.Random(1)
+    for k, bitDepth in ((1, 1), (2, 1), (3, 2), (4, 2), (5, 4), (16, 4), (17, 8), (256, 8)):
+        ok = True
+        for width, height in ((1, 17), (3, 7), (5, 5), (7, 3), (9, 2), (13, 5), (37, 9)):
+            if width * height < k: continue
+            img = paletteImage(k, width, height, rnd)
+            for backend in ['python', 'numpy'] if render.numpy() else ['python']:
+                png = render.PNGPacker({'colorType': 3, 'filterType': -1, 'backend': backend}).toPNG(img, width, height)
+                w, h, colorType, depth, pixels, filters = decodePNG(png)
+                ok = ok and (3, bitDepth) == (colorType, depth) and pixels == rgbPixels(img, width, height)
+        check('palette of %d colors, bit depth %d, odd widths' % (k, bitDepth), ok)
+
+    # over 256 colors, rgb unless quantized to fewer levels per channel
+    img = paletteImage(257, 37, 9, rnd)
+    w, h, colorType, depth, pixels, filters = decodePNG(render.PNGPacker({'colorType': 3}).toPNG(img, 37, 9))
+    check('palette of 257 colors falls back to rgb', 2 == colorType and pixels == rgbPixels(img, 37, 9))
+    w, h, colorType, depth, pixels, filters = decodePNG(render.PNGPacker({'colorType': 3, 'quantize': True}).toPNG(img, 37, 9))
+    quantized = [bytes(img).translate(render.quantizeTable(bits)) for bits in range(7, 0, -1)]
+    check('palette of 257 colors quantized', 3 == colorType and any(pixels == rgbPixels(q, 37, 9) and len(set(pixels)) <= 256 for q in quantized))
+
+    # a gradient captcha has fewer than 256 colors
+    captcha = mod.SimpleCaptcha()
+    random.seed(1)
+    formula, result = captcha.formula(3, 1, 20, True, True, True, 1)
+    img, width, height = captcha.image(formula, [0xff0000, 0x0000ff], [0xffffff], 2, 1, None)
+    w, h, colorType, depth, pixels, filters = decodePNG(render.PNGPacker({'colorType': 3}).toPNG(img, width, height))
+    check('palette of a gradient captcha', 3 == colorType and pixels == rgbPixels(img, width, height))
+
+def check_gray(mod):
+    # gray captchas are rendered in one channel and encoded as grayscale by default
+    render = mod.renderer()
+    random.seed(1)
+    captcha = mod.SimpleCaptcha()
+    w, h, colorType, depth, pixels, filters = decodePNG(base64.b64decode(captcha.getCaptcha().split(',', 1)[1]))
+    check('gray captcha is a grayscale png by default', 0 == colorType and 8 == depth and all(p[0] == p[1] == p[2] for p in pixels))
+    random.seed(1)
+    w2, h2, colorType, depth, pixels2, filters = decodePNG(base64.b64decode(captcha.option('png_options', {'colorType': 2}).reset().getCaptcha().split(',', 1)[1]))
+    check('gray captcha with colorType 2 is the same image', 2 == colorType and (w, h, pixels) == (w2, h2, pixels2))
+
+    # gray canvases decode to the same pixels with every color type
+    for label, (img, width, height) in testImages(mod):
+        if len(img) != width * height: continue
+        ok = True
+        for colorType in (0, 2, 3, 6):
+            w, h, ct, depth, pixels, filters = decodePNG(render.PNGPacker({'colorType': colorType, 'filterType': -1}).toPNG(img, width, height))
+            ok = ok and (colorType == ct or (3 == colorType and 2 == ct)) and pixels == rgbPixels(img, width, height)
+        check('%s with colorType 0, 2, 3 and 6' % label, ok)
+
+    # a color canvas can not be encoded as grayscale
+    img, width, height = testImages(mod)[1][1]
+    try:
+        render.PNGPacker({'colorType': 0}).toPNG(img, width, height)
+        raised = False
+    except Exception:
+        raised = True
+    check('color captcha with colorType 0 raises', raised)
+
+def check_deflate(mod):
+    # deflate() with and without chunks, also of empty data
+    render = mod.renderer()
+    data = bytes(random.Random(1).randrange(4) for i in range(10000))
+    ok = True
+    for chunkSize in (None, 1024, 3000):
+        for d in (data, b''):
+            ok = ok and d == zlib.decompress(render.deflate(d, 9, chunkSize))
+    check('deflate() chunks and empty data', ok)
+
+def check_validate(mod):
+    # the pre-keyed hmac gives the same hash as hmac of secret_salt and answer with secret_key
+    captcha = mod.SimpleCaptcha().option('secret_key', 'KEY').option('secret_salt', 'SALT_')
+    expected = hmac.new(b'KEY', b'SALT_42', hashlib.sha256).hexdigest()
+    check('validate() hash of the answer', expected == captcha.answerHash(42) and expected == captcha.answerHash(42))
+    check('validate() right answer', captcha.validate(42, expected) and captcha.validate('42', expected))
+    check('validate() wrong answer', not captcha.validate(43, expected) and not captcha.validate(42, expected[:-1]) and not captcha.validate(42, None))
+    captcha.option('secret_key', 'OTHER_KEY')
+    check('validate() after secret_key changes', not captcha.validate(42, expected))
+    random.seed(1)
+    captcha.reset()
+    check('validate() of generate(), one answer only', 1 == sum(captcha.validate(answer, captcha.getHash()) for answer in range(1000)))
+
+def formulaResults(mod, terms):
+    # every result formula() can produce, by running it for every sequence of its random choices
+    num_terms, max_num_terms, min_term, max_term, has_mult, has_div = terms
+    render = mod.renderer()
+    rand = render.rand
+    captcha = mod.SimpleCaptcha()
+    results = set()
+    try:
+        for num in range(num_terms, max(num_terms, max_num_terms) + 1):
+            sequences = [[]]
+            while sequences:
+                sequence = sequences.pop()
+                choices = []
+                def choose(m, M):
+                    # the given choice, else the smallest, larger choices are run later
+                    i = len(choices)
+                    choices.append(sequence[i] if i < len(sequence) else m)
+                    if i >= len(sequence): sequences.extend(choices[:i] + [v] for v in range(m + 1, M + 1))
+                    return choices[i]
+                render.rand = choose
+                results.add(captcha.formula(num, min_term, max_term, has_mult, has_div, True, 1)[1])
+    finally:
+        render.rand = rand
+    return results
+
+def check_hash_table(mod, n=5000):
+    # possibleAnswers() has exactly the results of formula() for small ranges, and every sampled result otherwise
+    captcha = mod.SimpleCaptcha()
+    for terms in [(2, -1, 1, 20, True, True), (3, -1, 0, 6, True, False), (2, -1, 1, 6, False, True), (2, 3, 1, 5, True, True)]:
+        answers = mod.possibleAnswers(*terms)
+        check('possibleAnswers%s' % str(terms), formulaResults(mod, terms) == set(answers) and max(answers) <= mod.maxAnswer(*terms))
+    random.seed(1)
+    for terms in [(2, 4, 1, 21, True, True), (3, -1, 5, 500, True, True)]:
+        num_terms, max_num_terms, min_term, max_term, has_mult, has_div = terms
+        answers = set(mod.possibleAnswers(*terms))
+        results = set(captcha.formula(random.randint(num_terms, max(num_terms, max_num_terms)), min_term, max_term, has_mult, has_div, True, 1)[1] for i in range(n))
+        check('possibleAnswers%s' % str(terms), results <= answers and max(answers) <= mod.maxAnswer(*terms))
+
+    # table lookups give the same hashes as the hmac
+    captcha = mod.SimpleCaptcha().option('max_num_terms', 3).option('hash_table', True)
+    table = captcha.hashTable()
+    check('hashTable() hashes are the hmac of each answer', bool(table) and all(h == captcha.keyedHash(answer) for answer, h in table.hashes.items()))
+    check('validate() with hash table', captcha.validate(7, captcha.keyedHash(7)) and not captcha.validate(7, captcha.keyedHash(8)) and captcha.validate(100000, captcha.keyedHash(100000)))
+    captcha.option('secret_key', 'OTHER_KEY')
+    check('hashTable() rebuilt after secret_key changes', captcha.hashTable() is not table and captcha.validate(7, captcha.keyedHash(7)))
+
+    # too many answers, the table is skipped before they are computed
+    captcha.option('max_term', 100000)
+    t = time.perf_counter()
+    check('hashTable() skipped over the limit', (False is captcha.hashTable()) and (time.perf_counter() - t < 0.01) and captcha.validate(7, captcha.keyedHash(7)))
+
+def check_tokens(mod):
+    captcha = mod.SimpleCaptcha().option('token_ttl', 60)
+    token = captcha.createToken(42)
+    check('token length and expiry', mod.TOKEN_LENGTH == len(token) and 0 < int(token[:8], 16) - time.time() <= 60)
+    check('token right answer', captcha.validate(42, token) and captcha.validate(42, token))
+    check('token wrong answer', not captcha.validate(43, token))
+    check('token of another nonce', token[8:mod.TOKEN_HEADER_LENGTH] != captcha.createToken(42)[8:mod.TOKEN_HEADER_LENGTH])
+    check('token expired', not captcha.validate(42, captcha.createToken(42, int(time.time()) - 1)))
+    # any changed hex digit, in the expiry, nonce or mac, is rejected
+    check('token tampered', not any(captcha.validate(42, token[:i] + ('0' if '0' != token[i] else '1') + token[i+1:]) for i in range(len(token))))
+    check('token expiry extended', not captcha.validate(42, 'ffffffff' + token[8:]))
+    check('token malformed', not any(captcha.validate(42, t) for t in (token[:-1], token + '0', 'zzzzzzzz' + token[8:], '', None)))
+    check('token is not a plain hash', not captcha.validate(42, captcha.answerHash(42)) and not mod.SimpleCaptcha().validate(42, token))
+    random.seed(1)
+    captcha.reset()
+    check('token of generate(), one answer only', 1 == sum(captcha.validate(answer, captcha.getHash()) for answer in range(1000)))
+
+class UsedNonces:
+    # replay guard of another store
+    def __init__(self):
+        self.nonces = set()
+
+    def add(self, nonce, expiry):
+        if nonce in self.nonces: return False
+        self.nonces.add(nonce)
+        return True
+
+def check_replay_guard(mod):
+    captcha = mod.SimpleCaptcha().option('token_ttl', 60).option('replay_guard', mod.ReplayGuard())
+    tokens = [captcha.createToken(42) for i in range(1000)]
+    check('replay guard accepts a token once', not captcha.validate(43, tokens[0]) and captcha.validate(42, tokens[0]) and not captcha.validate(42, tokens[0]))
+    check('replay guard accepts other tokens', all(captcha.validate(42, token) for token in tokens[1:]) and not any(captcha.validate(42, token) for token in tokens))
+    check('replay guard of another store', (lambda guard: captcha.option('replay_guard', guard).validate(42, tokens[0]) and not captcha.validate(42, tokens[0]) and 1 == len(guard.nonces))(UsedNonces()))
+
+    # plain hashes can not be guarded, nor tokens longer than the guard window
+    for ttl, guard, label in [(0, True, 'shared'), (0, UsedNonces(), 'another'), (7200, True, 'shared'), (120, mod.ReplayGuard(window=60), '60 s window')]:
+        captcha = mod.SimpleCaptcha().option('token_ttl', ttl).option('replay_guard', guard)
+        errors = 0
+        for f in (lambda: captcha.validate(42, captcha.answerHash(42)), lambda: captcha.reset().generate()):
+            try:
+                f()
+            except Exception:
+                errors += 1
+        check('replay guard (%s) with token_ttl %d raises' % (label, ttl), 2 == errors)
+
+    # at most two filters, of the current and next window
+    guard = mod.ReplayGuard(capacity=1000, window=60)
+    now = int(time.time())
+    for expiry in range(now - 600, now + 60, 10): guard.add(os.urandom(8).hex(), expiry)
+    check('replay guard keeps at most two filters', len(guard.filters) <= 2)
+
+    # the shared guard is created once by concurrent first uses
+    mod._replayGuard = None
+    guards = []
+    threads = [threading.Thread(target=lambda: guards.append(mod.replayGuard())) for i in range(16)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+    check('replay guard shared', 16 == len(guards) and all(guard is guards[0] for guard in guards) and guards[0] is mod.replayGuard())
+
+def check_keyring(mod):
+    for ttl in (0, 60):
+        label = 'keyring, %s' % ('token' if ttl else 'hash')
+        captcha = mod.SimpleCaptcha().option('token_ttl', ttl).option('keyring', {'old': 'OLD_KEY', 'new': {'key': 'NEW_KEY'}})
+        random.seed(1)
+        captcha.reset()
+        hash = captcha.getHash()
+        right = next((answer for answer in range(1000) if captcha.validate(answer, hash)), None)
+        check(label + ' issued with the last key', hash.startswith('new.') and (right is not None))
+        check(label + ' wrong key id', not any(captcha.validate(right, prefix + hash[4:]) for prefix in ('old.', 'none.', '', '.')))
+        captcha.option('key_id', 'old')
+        old = captcha.reset().getHash()
+        right_old = next(answer for answer in range(1000) if captcha.validate(answer, old))
+        check(label + ' issued with key_id', old.startswith('old.') and captcha.validate(right, hash))
+
+        # a retired key is accepted during the grace time, but new hashes use the last key without expiry time
+        captcha.retireKey('old', 60)
+        check(label + ' retired key in grace time', captcha.validate(right_old, old) and captcha.reset().getHash().startswith('new.') and (captcha.option('key_id') is None))
+        captcha.retireKey('old', -1)
+        check(label + ' retired key after grace time', not captcha.validate(right_old, old) and captcha.validate(right, hash))
+
+        # the last key without expiry time can not be retired, keys with expiry time never issue hashes
+        errors = 0
+        for f in (lambda: captcha.retireKey('new', 60), lambda: captcha.option('key_id', 'old').reset().generate(), lambda: mod.SimpleCaptcha().option('keyring', {'a.b': 'KEY'}).generate(), lambda: mod.SimpleCaptcha().option('keyring', {1: 'KEY'}).generate()):
+            try:
+                f()
+            except Exception:
+                errors += 1
+        check(label + ' no key left to issue hashes raises', 4 == errors and captcha.validate(right, hash))
+
+def checks(path):
+    mod = load_module('SimpleCaptcha', path)
+    print('SimpleCaptcha.VERSION ' + mod.SimpleCaptcha.VERSION)
+    check_renderer(mod)
+    check_fill_row(mod)
+    check_scale(mod)
+    check_warps(mod)
+    check_backends(mod)
+    check_filters(mod)
+    check_deflate(mod)
+    check_palette(mod)
+    check_gray(mod)
+    check_validate(mod)
+    check_hash_table(mod)
+    check_tokens(mod)
+    check_replay_guard(mod)
+    check_keyring(mod)
+
+# usage: python check.py
+# exits with status 1 if any check fails
+checks(os.path.abspath(os.path.join(DIR, '../../src/python/')))
+if failed:
+    print('%d checks failed' % len(failed))
+    sys.exit(1)
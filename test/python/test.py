@@ -57,6 +57,18 @@ def test():
     print("\n")
     print(captcha.getHash())
 
+    print("\n")
+
+    captcha.reset()
+    captcha.option('difficulty', 1) # difficulty 0 (easy) to 3 (difficult)
+    captcha.option('distortion_type', 1) # 1: position distortion
+    captcha.option('color', 0x121212) # text color
+    captcha.option('background', tile) # background image tile
+
+    print(captcha.getCaptcha())
+    print("\n")
+    print(captcha.getHash())
+
 
 print('SimpleCaptcha.VERSION ' + SimpleCaptcha.VERSION)
 